@@ -1,16 +1,87 @@
+import argparse
+import asyncio
+import atexit
+import contextlib
+import functools
 import logging
 import os
 import random
+import tempfile
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 
+import numpy as np
+import orjson
 import pandas as pd
 import requests
 from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
+from urllib3.util import make_headers
+from urllib3.util.retry import Retry
 
 load_dotenv()
 
 user_agent = os.getenv("EMAIL_ADDRESS")
 
+logger = logging.getLogger(__name__)
+
+MAX_REQUESTS_PER_SECOND = 10  # SEC's fair-access limit, shared by all threads
+
+
+class _RateLimitedAdapter(HTTPAdapter):
+    """HTTPAdapter that starts requests at least min_interval seconds apart."""
+
+    def __init__(self, min_interval: float, **kwargs):
+        self.min_interval = min_interval
+        self._lock = threading.Lock()
+        self._next_start = 0.0
+        super().__init__(**kwargs)
+
+    def send(self, request, **kwargs):
+        # Reserve the next free start time under the lock, then sleep outside it
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_start)
+            self._next_start = start + self.min_interval
+        if start > now:
+            time.sleep(start - now)
+        return super().send(request, **kwargs)
+
+
+# One pooled session for every SEC request, so repeat calls to sec.gov and
+# data.sec.gov reuse the open TCP/TLS connection instead of a new handshake.
+# Responses are requested compressed; make_headers() only offers 'br' when the
+# brotli package is installed to decode it. Every request through the session
+# is spaced to stay within MAX_REQUESTS_PER_SECOND.
+SESSION = requests.Session()
+SESSION.headers.update(
+    {
+        "User-Agent": user_agent,
+        "Accept-Encoding": make_headers(accept_encoding=True)["accept-encoding"],
+    }
+)
+SESSION.mount(
+    "https://",
+    _RateLimitedAdapter(
+        min_interval=1 / MAX_REQUESTS_PER_SECOND,
+        pool_connections=16,
+        pool_maxsize=16,
+        max_retries=Retry(
+            total=3, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504]
+        ),
+    ),
+)
+atexit.register(SESSION.close)
+
+CACHE_DIR = os.path.expanduser("~/.cache/sec_pipeline")
+TICKERS_URL = "https://www.sec.gov/files/company_tickers.json"
+FACTS_URL = "https://data.sec.gov/api/xbrl/companyfacts/CIK{}.json"
+TICKERS_CACHE_TTL = 24 * 60 * 60  # seconds before company_tickers is revalidated
+FACTS_CACHE_TTL = 24 * 60 * 60  # seconds a cached companyfacts file is reused
+# Caps requests in flight; the per-second rate is enforced by SESSION's adapter
+MAX_CONCURRENT_REQUESTS = 10
+
 
 def format_values(num: int) -> str:
     """
@@ -35,8 +106,251 @@ def format_values(num: int) -> str:
     return str(num)
 
 
+_SCALES = np.array([1.0, 1e6, 1e9, 1e12])
+_SUFFIXES = np.array(["", "M", "B", "T"])
+
+
+def format_array(values: np.ndarray) -> np.ndarray:
+    """
+    format_values() for a whole numpy array in one vectorized pass
+
+    Examples:
+    >>> format_array(np.array([1_230_000_000_000, 4_560_000_000, 123])).tolist()
+    ['1.23T', '4.56B', '123']
+    >>> format_array(np.array([-7_890_000_000, 0.53, np.nan])).tolist()
+    ['-7.89B', '0.53', 'nan']
+    """
+    abs_values = np.abs(values)
+    # Index into _SCALES/_SUFFIXES from the base-1000 magnitude:
+    # below 1M -> 0, M -> 1, B -> 2, T and above -> 3.
+    exponent = np.log10(
+        abs_values, out=np.zeros(abs_values.shape), where=abs_values >= 1e6
+    )
+    magnitude = np.clip(np.nan_to_num(exponent, posinf=12) // 3 - 1, 0, 3)
+    magnitude = magnitude.astype(np.intp)
+    # log10 can round up to the next threshold for values just below it
+    magnitude -= (magnitude > 0) & (abs_values < _SCALES[magnitude])
+
+    scaled = np.char.add(
+        np.char.mod("%.2f", values / _SCALES[magnitude]), _SUFFIXES[magnitude]
+    )
+    return np.where(magnitude == 0, values.astype(str), scaled)
+
+
 def _format_values(merged_df: pd.DataFrame) -> pd.DataFrame:
-    return merged_df.map(format_values)
+    """Apply format_array() to each column, keeping the column's own dtype."""
+    return pd.DataFrame(
+        {
+            column: format_array(series.to_numpy())
+            for column, series in merged_df.items()
+        },
+        index=merged_df.index,
+    )
+
+
+def _is_fresh(path: str, max_age: float) -> bool:
+    """True if path exists and was last written less than max_age seconds ago."""
+    try:
+        return time.time() - os.path.getmtime(path) < max_age
+    except OSError:
+        return False
+
+
+def _conditional_headers(cache_path: str) -> dict:
+    """
+    If-None-Match/If-Modified-Since headers built from the validators saved next to
+    a cached response, or {} if there is no cached copy to revalidate.
+    """
+    validators_path = cache_path + ".etag"
+    if not (os.path.exists(cache_path) and os.path.exists(validators_path)):
+        return {}
+
+    try:
+        with open(validators_path, "rb") as f:
+            validators = orjson.loads(f.read())
+    except (OSError, ValueError) as e:
+        # A bad sidecar only costs the revalidation, never the request
+        logger.warning(f"Ignoring cache file {validators_path}: {e}")
+        return {}
+    if not isinstance(validators, dict):
+        return {}
+    headers = {}
+    if "ETag" in validators:
+        headers["If-None-Match"] = validators["ETag"]
+    if "Last-Modified" in validators:
+        headers["If-Modified-Since"] = validators["Last-Modified"]
+    return headers
+
+
+def _save_validators(cache_path: str, response: requests.Response) -> None:
+    """Store the response's ETag/Last-Modified next to its cached copy."""
+    validators = {
+        key: response.headers[key]
+        for key in ("ETag", "Last-Modified")
+        if key in response.headers
+    }
+    try:
+        _replace_file(cache_path + ".etag", orjson.dumps(validators))
+    except OSError as e:
+        logger.warning(f"Could not write cache file {cache_path}.etag: {e}")
+
+
+def _replace_file(path: str, content: bytes) -> None:
+    """
+    Write content to a unique temporary file beside path and move it into place, so
+    an interrupted or concurrent write never leaves a partial file for the next read.
+    """
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    fd, partial_path = tempfile.mkstemp(dir=directory, suffix=".part")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(content)
+        os.replace(partial_path, path)
+    finally:
+        # Already gone if it was moved into place
+        with contextlib.suppress(OSError):
+            os.remove(partial_path)
+
+
+def _write_cache(cache_path: str, response: requests.Response) -> None:
+    """
+    Save a response body and its validators under cache_path. An OSError is logged
+    rather than raised, since the caller already has the parsed response.
+    """
+    try:
+        _replace_file(cache_path, response.content)
+    except OSError as e:
+        logger.warning(f"Could not write cache file {cache_path}: {e}")
+        return
+    _save_validators(cache_path, response)
+
+
+def _stream_to_cache(response: requests.Response, cache_path: str) -> dict:
+    """
+    Stream a response body to a unique temporary file beside cache_path in chunks
+    rather than buffering it in memory, parse it, and only then move it into place
+    with its validators. If the cache directory cannot be written, the body is
+    parsed from memory instead; an OSError part way through the download is raised,
+    since by then the body has been partly consumed.
+    """
+    cache_dir = os.path.dirname(cache_path)
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        fd, partial_path = tempfile.mkstemp(dir=cache_dir, suffix=".part")
+    except OSError as e:
+        logger.warning(f"Could not write cache file {cache_path}: {e}")
+        return orjson.loads(response.content)
+
+    try:
+        with os.fdopen(fd, "wb") as f:
+            for chunk in response.iter_content(chunk_size=64 * 1024):
+                f.write(chunk)
+        with open(partial_path, "rb") as f:
+            data = orjson.loads(f.read())
+        try:
+            os.replace(partial_path, cache_path)
+        except OSError as e:
+            logger.warning(f"Could not write cache file {cache_path}: {e}")
+            return data
+    finally:
+        # Already gone if it was moved into place
+        with contextlib.suppress(OSError):
+            os.remove(partial_path)
+    _save_validators(cache_path, response)
+    return data
+
+
+def _read_cache(cache_path: str) -> dict | None:
+    """
+    Parse a cached response, or return None if it is missing or corrupt. A copy that
+    fails to parse is deleted along with its validators, so the next request for it
+    is a plain GET instead of a revalidation that would 304 back to the same bytes.
+    """
+    try:
+        with open(cache_path, "rb") as f:
+            return orjson.loads(f.read())
+    except FileNotFoundError:
+        return None
+    except OSError as e:
+        logger.warning(f"Could not read cache file {cache_path}: {e}")
+        return None
+    except orjson.JSONDecodeError as e:
+        logger.warning(f"Discarding corrupt cache file {cache_path}: {e}")
+        for path in (cache_path, cache_path + ".etag"):
+            with contextlib.suppress(OSError):
+                os.remove(path)
+        return None
+
+
+def _load_cached(cache_path: str) -> dict | None:
+    """Parse a cached response after a 304 and restart its freshness window."""
+    cached = _read_cache(cache_path)
+    if cached is not None:
+        with contextlib.suppress(OSError):
+            os.utime(cache_path)
+    return cached
+
+
+def _load_tickers() -> dict:
+    """
+    Return the SEC company_tickers.json, cached under CACHE_DIR. A copy younger than
+    TICKERS_CACHE_TTL is used without any request; an older one is revalidated with
+    its ETag/Last-Modified, so an unchanged file costs a 304 instead of a download,
+    and is still used if the request fails.
+    """
+    cache_path = os.path.join(CACHE_DIR, "company_tickers.json")
+    if _is_fresh(cache_path, TICKERS_CACHE_TTL):
+        tickers = _read_cache(cache_path)
+        if tickers is not None:
+            return tickers
+
+    try:
+        tickers_data = SESSION.get(
+            TICKERS_URL, headers=_conditional_headers(cache_path), timeout=10
+        )
+        if tickers_data.status_code == 304:
+            tickers = _load_cached(cache_path)
+            if tickers is not None:
+                return tickers
+            # The cached copy was corrupt and has been discarded, so fetch it in full
+            tickers_data = SESSION.get(TICKERS_URL, timeout=10)
+        tickers_data.raise_for_status()
+        tickers = orjson.loads(tickers_data.content)
+    except (requests.RequestException, orjson.JSONDecodeError) as e:
+        # An out-of-date copy is still better than no data
+        tickers = _read_cache(cache_path)
+        if tickers is None:
+            raise
+        logger.warning(f"Request failed, using the cached {cache_path}: {e}")
+        return tickers
+
+    _write_cache(cache_path, tickers_data)
+    return tickers
+
+
+_ticker_index_lock = threading.Lock()
+
+
+def _get_ticker_index() -> dict[str, str]:
+    """
+    Map each ticker to its 10-character CIK id, built once from _load_tickers().
+    lru_cache alone lets concurrent first callers each build it, so they queue on a
+    lock and all but the first get the cached index.
+    """
+    with _ticker_index_lock:
+        return _build_ticker_index()
+
+
+@functools.lru_cache(maxsize=1)
+def _build_ticker_index() -> dict[str, str]:
+    return {obj["ticker"]: f'{obj["cik_str"]:010}' for obj in _load_tickers().values()}
+
+
+@functools.lru_cache(maxsize=1)
+def _get_cik_list() -> list[str]:
+    """Every CIK id in the ticker index, for picking a random company."""
+    return list(_get_ticker_index().values())
 
 
 def fetch_cik(company_name: str = "") -> str:
@@ -47,112 +361,165 @@ def fetch_cik(company_name: str = "") -> str:
     :param company_name: str, user-specified company ticker symbol, e.g., 'AMZN' for Amazon.
     :return: str, CIK id of the specified or random company. Must be a width of 10 characters.
     """
-    headers = {"User-Agent": user_agent}
-    get_url = "https://www.sec.gov/files/company_tickers.json"
-
     try:
-        tickers_data = requests.get(get_url, headers=headers)
-        tickers_json = tickers_data.json()
-    except requests.RequestException as e:
+        ticker_index = _get_ticker_index()
+    except (requests.RequestException, orjson.JSONDecodeError) as e:
         print(f"Request failed: {e}")
         return ""
 
     company_name = company_name.upper()
     if company_name:
-        for obj in tickers_json.values():
-            if obj["ticker"] == company_name:
-                return f'{obj["cik_str"]:010}'
-        print(f"Company with ticker {company_name} not found.")
-        return ""
+        cik = ticker_index.get(company_name, "")
+        if not cik:
+            print(f"Company with ticker {company_name} not found.")
+        return cik
     else:
-        random_obj = random.choice(list(tickers_json.values()))
-        return f'{random_obj["cik_str"]:010}'
+        return random.choice(_get_cik_list())
 
 
 # Fix this function
-def fetch_sec_api(cik_str: str) -> dict:
+def fetch_sec_api(cik_str: str, use_cache: bool = True) -> dict:
     """
     send GET request to the EDGAR database where SEC filings are stored.
     Returns the response data as a JSON object if the request is successful.
     Raises an exception if the request fails.
+
+    Responses are cached under CACHE_DIR and reused for FACTS_CACHE_TTL seconds;
+    after that the cached copy is revalidated with its ETag/Last-Modified and only
+    re-downloaded if the SEC has a newer one, or served as-is if the request fails.
+    use_cache=False always re-downloads.
     """
+    cache_path = os.path.join(CACHE_DIR, "facts", f"CIK{cik_str}.json")
+    if use_cache and _is_fresh(cache_path, FACTS_CACHE_TTL):
+        facts = _read_cache(cache_path)
+        if facts is not None:
+            return facts
+
+    get_url = FACTS_URL.format(cik_str)
     try:
-        headers = {"User-Agent": user_agent}
-        get_url = f"https://data.sec.gov/api/xbrl/companyfacts/CIK{cik_str}.json"
-        sec_data = requests.get(get_url, headers=headers)
+        headers = _conditional_headers(cache_path) if use_cache else {}
+        with SESSION.get(get_url, headers=headers, timeout=10, stream=True) as sec_data:
+            if sec_data.status_code == 304:
+                facts = _load_cached(cache_path)
+                # A corrupt copy has been discarded, so download it in full
+                return facts if facts is not None else fetch_sec_api(cik_str, False)
+            sec_data.raise_for_status()
+            try:
+                return _stream_to_cache(sec_data, cache_path)
+            except OSError as e:
+                logger.warning(f"Could not write cache file {cache_path}: {e}")
+
+        # The failed cache write consumed part of the body, so fetch it again
+        sec_data = SESSION.get(get_url, timeout=10)
         sec_data.raise_for_status()
-        return sec_data.json()
-    except requests.RequestException as e:
+        return orjson.loads(sec_data.content)
+    except (requests.RequestException, orjson.JSONDecodeError) as e:
         print(f"Request failed: {e}")
-        return {}
+        # An out-of-date copy is still better than no data
+        facts = _read_cache(cache_path) if use_cache else None
+        if facts is None:
+            return {}
+        logger.warning(f"Using the cached {cache_path} instead")
+        return facts
 
 
-def clean_company_data(json_file: dict, account_list: list[str]) -> list[pd.DataFrame]:
+def clean_company_data(gaap: dict, account_list: list[str]) -> pd.DataFrame:
     """
-    clean company JSON data and return a list of DataFrames
-    :param json_file: dict: financial data for company
+    clean company JSON data and return a single DataFrame of fiscal-year values
+    :param gaap: dict: the company's 'us-gaap' facts, as returned by fetch_facts()
     :param account_list: list of account that user would like to add to df e.g 'Assets', 'Liabilities', etc.
-    :return: list: list of dataframes for unique accounts
+    :return: pd.DataFrame: 'year' column plus one column per account, sorted by year
     """
-    company_dfs = []
+    fiscal_years_by_account: dict[str, dict[int, float]] = {}
     for account in account_list:
-        try:
-            acc_data = json_file["facts"]["us-gaap"][account]["units"]["USD"]
-            df = pd.DataFrame.from_dict(acc_data)
-            df = df[df["fp"] == "FY"]
-            df["year"] = pd.to_datetime(df["end"]).dt.year
-            df = df.drop_duplicates(subset=["year"], keep="last")
-            df = df[["year", "val"]]
-            df = df.rename(columns={"val": account})
-            company_dfs.append(df)
-        except KeyError as e:
-            print(f"df could not be processed for: {e}")
-            company_dfs.append(pd.DataFrame({}))
-    return company_dfs
-
-
-def merge_final_df(df_list: list[pd.DataFrame]) -> pd.DataFrame:
-    """merge list of dfs and return df"""
-    cleaned_df_list = [df for df in df_list if not df.empty]
-
-    merged_df = cleaned_df_list[0]
-    for cdf in cleaned_df_list[1:]:
-        merged_df = pd.merge(merged_df, cdf, on="year", how="outer")
-
-    return merged_df
+        acc_data = gaap.get(account, {}).get("units", {}).get("USD")
+        if acc_data is None:
+            print(f"df could not be processed for: '{account}'")
+            continue
+        # 'end' is an ISO-8601 date, so the year is its first four characters.
+        # A later record for the same year overwrites an earlier one (keep="last").
+        fiscal_years_by_account[account] = {
+            int(record["end"][:4]): record["val"]
+            for record in acc_data
+            if record["fp"] == "FY"
+        }
+
+    # Every account is written into one preallocated float64 block by row
+    # index, instead of building and aligning a Series per account.
+    years = sorted(set().union(*fiscal_years_by_account.values()))
+    row_of_year = {year: row for row, year in enumerate(years)}
+    block = np.full((len(years), len(account_list)), np.nan)
+    for col, account in enumerate(account_list):
+        fiscal_years = fiscal_years_by_account.get(account)
+        if fiscal_years:
+            count = len(fiscal_years)
+            rows = np.fromiter(
+                (row_of_year[year] for year in fiscal_years), dtype=np.intp, count=count
+            )
+            block[rows, col] = np.fromiter(
+                fiscal_years.values(), dtype=np.float64, count=count
+            )
+
+    df = pd.DataFrame(
+        block,
+        index=pd.Index(np.array(years, dtype=np.int16), name="year"),
+        columns=account_list,
+        copy=False,
+    )
+    # An account with a whole-dollar value for every year goes back to int64, as
+    # in the per-account frames this replaced; only gaps need float64's nan. The
+    # cast gives those columns their own int64 block next to the float64 one.
+    is_whole = ~np.isnan(block).any(axis=0) & (block == np.trunc(block)).all(axis=0)
+    df = df.astype(
+        {account: np.int64 for account, whole in zip(account_list, is_whole) if whole}
+    )
+    return df.reset_index()
 
 
 def add_extra_columns(cleaned_df: pd.DataFrame) -> pd.DataFrame:
     """
-    Adds 'valuation', 'ac/l', and 'cf/l' columns to the DataFrame where:
+    Returns the DataFrame with 'valuation', 'ac/l', and 'cf/l' columns added where:
     - EARNINGS_MULTIPLIER is an arbitray multiple used to estimate company value based on future earnings.
     - 'valuation': (YEARS_TO_RECOVER_RETURN * CashFlows) + Cash - LongTermDebt
     - 'ac/l': Ratio of AssetsCurrent to Liabilities.
     - 'cf/l': Ratio of CashFlows to Liabilities.
     """
-    # Add 'valuation' column
     EARNINGS_MULTIPLIER = 20
-    cleaned_df["valuation"] = (
-        (EARNINGS_MULTIPLIER * cleaned_df["CashFlows"])
-        + cleaned_df["Cash"]
-        - cleaned_df["LongTermDebt"]
+    # Work on the raw float arrays so each expression skips pandas' index alignment
+    cash_flows = cleaned_df["CashFlows"].to_numpy(dtype=float)
+    cash = cleaned_df["Cash"].to_numpy(dtype=float)
+    long_term_debt = cleaned_df["LongTermDebt"].to_numpy(dtype=float)
+    assets_current = cleaned_df["AssetsCurrent"].to_numpy(dtype=float)
+    liabilities = cleaned_df["Liabilities"].to_numpy(dtype=float)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # 'valuation' column, accumulated in one buffer without temporaries
+        valuation = np.multiply(cash_flows, EARNINGS_MULTIPLIER)
+        np.add(valuation, cash, out=valuation)
+        np.subtract(valuation, long_term_debt, out=valuation)
+        if all(
+            pd.api.types.is_integer_dtype(cleaned_df[column])
+            for column in ("CashFlows", "Cash", "LongTermDebt")
+        ):
+            valuation = valuation.astype(np.int64)
+
+        # 'ac/l' column
+        assets_current_ratio = np.divide(assets_current, liabilities)
+        np.round(assets_current_ratio, 2, out=assets_current_ratio)
+
+        # 'cf/l' column
+        cash_flow_ratio = np.divide(cash_flows, liabilities)
+        np.round(cash_flow_ratio, 2, out=cash_flow_ratio)
+
+    # Attach the results together on a new frame rather than mutating the input
+    return cleaned_df.assign(
+        **{
+            "valuation": valuation,
+            "ac/l": assets_current_ratio,
+            "cf/l": cash_flow_ratio,
+        }
     )
 
-    # Add 'ac/l' column
-    cleaned_df["ac/l"] = round(
-        cleaned_df["AssetsCurrent"] / cleaned_df["Liabilities"], 2
-    )
-
-    # Add 'cf/l' column
-    cleaned_df["cf/l"] = round(cleaned_df["CashFlows"] / cleaned_df["Liabilities"], 2)
-
-    return cleaned_df
-
-
-logging.basicConfig(
-    level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-)
-
 
 def elapsed(func):
     def wrapper(*args, **kwargs):
@@ -160,14 +527,31 @@ def elapsed(func):
         result = func(*args, **kwargs)
         end_time = time.time()
         elapsed_time = end_time - start_time
-        logging.info(f"{func.__name__}() runtime: {elapsed_time:.3f}s")
+        logger.info(f"{func.__name__}() runtime: {elapsed_time:.3f}s")
         return result
 
     return wrapper
 
 
-@elapsed
-def process_financial_data(ticker: str = "META") -> pd.DataFrame:
+def fetch_facts(ticker: str, use_cache: bool = True) -> dict:
+    """
+    Fetch and parse a company's 'us-gaap' facts once. The returned dict can be
+    passed to clean_company_data() for as many account lists as needed without
+    re-reading the companyfacts JSON.
+
+    :param ticker: str, company ticker symbol, e.g. 'AMZN'.
+    :param use_cache: bool, passed through to fetch_sec_api().
+    :return: dict, the 'us-gaap' facts, or {} if they could not be fetched.
+    """
+    comp_cik = fetch_cik(ticker)
+    if not comp_cik:
+        return {}
+    company_data = fetch_sec_api(comp_cik, use_cache)
+    return company_data.get("facts", {}).get("us-gaap", {})
+
+
+def analyze(gaap: dict) -> pd.DataFrame:
+    """Build the formatted 10-K summary DataFrame from fetched 'us-gaap' facts."""
     specified_accounts = [
         "NetCashProvidedByUsedInOperatingActivities",
         "CashAndCashEquivalentsAtCarryingValue",
@@ -182,10 +566,7 @@ def process_financial_data(ticker: str = "META") -> pd.DataFrame:
         "CashAndCashEquivalentsAtCarryingValue": "Cash",
     }
 
-    comp_cik = fetch_cik(ticker)
-    company_data = fetch_sec_api(comp_cik)
-    clean_df_list = clean_company_data(company_data, specified_accounts)
-    result = merge_final_df(clean_df_list)
+    result = clean_company_data(gaap, specified_accounts)
     result = result.rename(columns=accounts_to_rename)
     result = add_extra_columns(result)
     result = result.drop(columns=accounts_to_drop)
@@ -194,6 +575,79 @@ def process_financial_data(ticker: str = "META") -> pd.DataFrame:
     return result_df
 
 
+@elapsed
+def process_financial_data(
+    ticker: str = "META", use_cache: bool = True
+) -> pd.DataFrame:
+    return analyze(fetch_facts(ticker, use_cache))
+
+
+async def _run_concurrently(func, items: list, *args) -> list:
+    """
+    Call func(item, *args) for every item on worker threads, with at most
+    MAX_CONCURRENT_REQUESTS calls in flight. Results keep the order of items;
+    a repeated item is only run once and shares its result.
+    """
+    unique_items = list(dict.fromkeys(items))
+    # A pool sized to the cap, rather than asyncio's CPU-sized default executor
+    loop = asyncio.get_running_loop()
+    with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_REQUESTS) as executor:
+        results = await asyncio.gather(
+            *(
+                loop.run_in_executor(executor, func, item, *args)
+                for item in unique_items
+            )
+        )
+    result_of_item = dict(zip(unique_items, results))
+    return [result_of_item[item] for item in items]
+
+
+async def fetch_many(ciks: list[str], use_cache: bool = True) -> list[dict]:
+    """
+    Run fetch_sec_api() for several CIK ids concurrently over the shared SESSION.
+
+    :param ciks: list of 10-character CIK ids, e.g. from fetch_cik().
+    :param use_cache: bool, passed through to fetch_sec_api().
+    :return: list of companyfacts dicts, in the same order as ciks.
+    """
+    return await _run_concurrently(fetch_sec_api, ciks, use_cache)
+
+
+async def process_many(
+    tickers: list[str], use_cache: bool = True
+) -> list[pd.DataFrame]:
+    """
+    Run process_financial_data() for several tickers concurrently. The CIK and
+    companyfacts requests for one ticker depend on each other, so the overlap
+    comes from running different tickers side by side on worker threads.
+
+    :param tickers: list of company ticker symbols, e.g. ['AMZN', 'META'].
+    :param use_cache: bool, passed through to fetch_sec_api().
+    :return: list of DataFrames, in the same order as tickers.
+    """
+    return await _run_concurrently(process_financial_data, tickers, use_cache)
+
+
+def main():
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    )
+    parser = argparse.ArgumentParser(
+        description="Print 10-K data for a company from the SEC API."
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="re-download the company's SEC data instead of using the cached copy",
+    )
+    args = parser.parse_args()
+
+    financials_df = process_financial_data(ticker="META", use_cache=not args.no_cache)
+    # Show every year and column, scoped to this print rather than set globally
+    with pd.option_context("display.max_rows", None, "display.max_columns", None):
+        print(financials_df)
+
+
 if __name__ == "__main__":
-    financials_df = process_financial_data(ticker="META")
-    print(financials_df)
+    main()
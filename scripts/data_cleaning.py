@@ -10,6 +10,8 @@ Current issues in cleaning the SEC API data arise from the nature of accounting
 This module is currently in progress until a clear and concise method to handle the different data routes is found.
 """
 
+import math
+
 import pandas as pd
 
 
@@ -31,20 +33,31 @@ def prep_data(json_data: dict) -> dict:
         return {}
 
 
+def _empty_account_df(account: str) -> pd.DataFrame:
+    """Empty get_df() result with real dtypes, so a later concat stays numeric."""
+    return pd.DataFrame(
+        {account: pd.Series(dtype="float64")},
+        index=pd.Index([], dtype="int16", name="year"),
+    )
+
+
 def get_df(data: dict, account: str) -> pd.DataFrame:
-    """Clean company json data from fetch_file() and return a pandas DataFrame."""
+    """Clean company json data from fetch_file() into a year-indexed DataFrame."""
     try:
         acc_data = data[account]["units"]["USD"]
-        df = pd.DataFrame.from_dict(acc_data)
-        df = df[df["fp"] == "FY"]
-        df["year"] = pd.to_datetime(df["end"]).dt.year
-        df.drop_duplicates(subset=["year"], keep="last", inplace=True)
-        df = df[["year", "val"]]
-        df.rename(columns={"val": account}, inplace=True)
-        return df
+        # Drop quarterly records before building the frame, not after
+        fy_records = [record for record in acc_data if record.get("fp") == "FY"]
+        if not fy_records:
+            return _empty_account_df(account)
+        df = pd.DataFrame.from_records(fy_records, columns=["end", "val"])
+        df = df.assign(year=df["end"].str.slice(0, 4).astype("int16"))
+        df = df.drop_duplicates(subset=["year"], keep="last")
+        df = df[["year", "val"]].astype({"val": "float64"})
+        df = df.rename(columns={"val": account})
+        return df.set_index("year")
     except KeyError as e:
         print(f"df could not be processed for: {e}")
-        return pd.DataFrame({})
+        return _empty_account_df(account)
 
 
 def get_assets_df(prepped_json: dict) -> pd.DataFrame:
@@ -59,25 +72,28 @@ def get_liabilities_df(prepped_json: dict) -> pd.DataFrame:
 
 def get_equity_df(prepped_json: dict) -> pd.DataFrame:
     equity_df = get_df(prepped_json, "StockholdersEquity")
-    if equity_df == pd.DataFrame({}):
+    if equity_df.empty:
         equity_df = get_df(
             prepped_json,
             "StockholdersEquityIncludingPortionAttributableToNoncontrollingInterest",
         )
-    return equity_df
+    return equity_df.set_axis(["Equity"], axis=1)
 
 
 def merge_final_df(
     assets_df: pd.DataFrame, equity_df: pd.DataFrame, liabilities_df: pd.DataFrame
 ) -> pd.DataFrame:
-    """Merge assets, equity, and liabilities DataFrames."""
-    merged_df = pd.merge(assets_df, equity_df, on="year", how="outer")
-    if liabilities_df == pd.DataFrame({}):
+    """Merge year-indexed assets, equity, and liabilities DataFrames, sorted by year."""
+    merged_df = pd.concat(
+        [df for df in (assets_df, equity_df, liabilities_df) if not df.empty],
+        axis=1,
+        join="outer",
+        sort=True,
+    )
+    if liabilities_df.empty:
         merged_df["Liabilities"] = merged_df["Assets"] - merged_df["Equity"]
-    else:
-        merged_df = pd.merge(merged_df, liabilities_df, on="year", how="outer")
 
-    return merged_df
+    return merged_df.reset_index()
 
 
 def clean_company_data_using_dataframes(data_json: dict) -> dict:
@@ -86,7 +102,7 @@ def clean_company_data_using_dataframes(data_json: dict) -> dict:
     fundamental accounting categories 'Assets', 'Liabilities', and 'Equity'.
 
     :param data_json: dict: Financial data for the company.
-    :return dict: Cleaned financial data.
+    :return dict: Cleaned financial data, as {column: {row: value}} with a 'year' column.
     """
     final_df = merge_final_df(
         get_assets_df(data_json),
@@ -96,10 +112,41 @@ def clean_company_data_using_dataframes(data_json: dict) -> dict:
     return final_df.to_dict()
 
 
+def _fiscal_year_values(data: dict, account: str) -> dict:
+    """Map year -> value for an account's FY records, keeping the last one per year."""
+    records = data.get(account, {}).get("units", {}).get("USD", [])
+    return {int(r["end"][:4]): r["val"] for r in records if r.get("fp") == "FY"}
+
+
 def clean_company_data(data_json: dict) -> dict:
     """
-    Placeholder function to clean company data without leaving dictionary form.
-    Actual implementation is in progress.
+    Clean company json data without building any DataFrame. Returns the same result
+    as clean_company_data_using_dataframes(), so either can be used.
+
+    :param data_json: dict: Financial data for the company.
+    :return dict: Cleaned financial data, as {column: {row: value}} with a 'year' column,
+    rows sorted by year and nan where a category has no value for that year.
     """
-    # Implement logic
-    return data_json
+    assets = _fiscal_year_values(data_json, "Assets")
+    equity = _fiscal_year_values(data_json, "StockholdersEquity")
+    if not equity:
+        equity = _fiscal_year_values(
+            data_json,
+            "StockholdersEquityIncludingPortionAttributableToNoncontrollingInterest",
+        )
+    liabilities = _fiscal_year_values(data_json, "Liabilities")
+    if not liabilities:
+        liabilities = {
+            year: assets.get(year, math.nan) - equity.get(year, math.nan)
+            for year in assets.keys() | equity.keys()
+        }
+
+    categories = {"Assets": assets, "Equity": equity, "Liabilities": liabilities}
+    years = sorted(set().union(*categories.values()))
+    final_dict = {"year": dict(enumerate(years))}
+    for category, values in categories.items():
+        if values:
+            final_dict[category] = {
+                row: float(values.get(year, math.nan)) for row, year in enumerate(years)
+            }
+    return final_dict
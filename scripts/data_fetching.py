@@ -1,84 +1,94 @@
 import asyncio
-import json
+import functools
 import os
 import time
-from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures import ThreadPoolExecutor
 
 import aiofiles
+import orjson
 from tqdm import tqdm
 
 
-def fetch_all_files(directory, request_limit):
-    """Opens all files in a selected directory synchronously"""
+def fetch_file(file_path, parse=True):
+    """
+    Helper function to fetch a single file synchronously or for threading.
+    Returns the parsed JSON, or the raw bytes when parse is False (pure I/O).
+    """
+    try:
+        with open(file_path, "rb") as f:
+            data = f.read()
+        return orjson.loads(data) if parse else data
+    except Exception as e:
+        print(f"Error opening file {file_path}: {e}")
+
+
+def fetch_all_files(directory, request_limit, parse=True, collect=False):
+    """
+    Opens all files in a selected directory synchronously.
+    Returns the contents as a list when collect is True, otherwise each file is
+    dropped once read so memory stays flat.
+    """
     files = os.listdir(directory)
+    results = []
     for file in tqdm(files[:request_limit], desc="Synchronous Progress"):
-        full_path = os.path.join(directory, file)
-        try:
-            with open(full_path, "r") as f:
-                json.load(f)
-        except Exception as e:
-            print(f"Error opening file {full_path}: {e}")
+        data = fetch_file(os.path.join(directory, file), parse)
+        if collect:
+            results.append(data)
+    return results if collect else None
 
 
-async def fetch_file_async(file_path):
-    """Helper function to fetch a single file asynchronously"""
+async def fetch_file_async(file_path, parse=True):
+    """
+    Helper function to fetch a single file asynchronously.
+    Returns the parsed JSON, or the raw bytes when parse is False (pure I/O).
+    """
     try:
-        async with aiofiles.open(file_path, "r") as f:
+        async with aiofiles.open(file_path, "rb") as f:
             data = await f.read()
-            json.loads(data)
+        return orjson.loads(data) if parse else data
     except Exception as e:
         print(f"Error opening file {file_path}: {e}")
 
 
-async def fetch_all_files_async(directory, request_limit):
-    """Opens all files in a selected directory asynchronously"""
+async def fetch_all_files_async(directory, request_limit, parse=True, collect=False):
+    """
+    Opens all files in a selected directory asynchronously.
+    Returns the contents as a list only when collect is True, like fetch_all_files().
+    """
+
+    async def fetch(full_path):
+        data = await fetch_file_async(full_path, parse)
+        return data if collect else None
+
     files = os.listdir(directory)
     tasks = []
     for file in tqdm(files[:request_limit], desc="Asynchronous Progress"):
         full_path = os.path.join(directory, file)
-        tasks.append(fetch_file_async(full_path))
-    await asyncio.gather(*tasks)
+        tasks.append(fetch(full_path))
+    results = await asyncio.gather(*tasks)
+    return results if collect else None
 
 
-def fetch_file(file_path):
-    """Helper function to fetch a single file for threading and multiprocessing"""
-    try:
-        with open(file_path, "r") as f:
-            json.load(f)
-    except Exception as e:
-        print(f"Error opening file {file_path}: {e}")
-
-
-def fetch_all_files_threading(directory, request_limit):
-    """Opens all files in a selected directory using threading"""
-    files = os.listdir(directory)
-    with ThreadPoolExecutor() as executor:
-        list(
-            tqdm(
-                executor.map(
-                    fetch_file,
-                    [os.path.join(directory, file) for file in files[:request_limit]],
-                ),
-                total=request_limit,
-                desc="Threading Progress",
-            )
-        )
-
-
-def fetch_all_files_multiprocessing(directory, request_limit):
-    """Opens all files in a selected directory using multiprocessing"""
+def fetch_all_files_threading(directory, request_limit, parse=True, collect=False):
+    """
+    Opens all files in a selected directory using threading.
+    Returns the contents as a list only when collect is True, like fetch_all_files().
+    """
     files = os.listdir(directory)
-    with ProcessPoolExecutor() as executor:
-        list(
-            tqdm(
-                executor.map(
-                    fetch_file,
-                    [os.path.join(directory, file) for file in files[:request_limit]],
-                ),
-                total=request_limit,
-                desc="Multiprocessing Progress",
-            )
-        )
+    results = []
+    # Reads are I/O-bound, so use more threads than cores
+    with ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) * 4)) as executor:
+        for data in tqdm(
+            executor.map(
+                functools.partial(fetch_file, parse=parse),
+                [os.path.join(directory, file) for file in files[:request_limit]],
+            ),
+            total=request_limit,
+            desc="Threading Progress",
+        ):
+            if collect:
+                results.append(data)
+    return results if collect else None
 
 
 def main():
@@ -103,12 +113,6 @@ def main():
     duration_threading = time.perf_counter() - start_time
     print(f"Threading: {duration_threading:.2f} seconds")
 
-    print("Starting multiprocessing requests...")
-    start_time = time.perf_counter()
-    fetch_all_files_multiprocessing(company_data_dir, num_requests)
-    duration_multiprocessing = time.perf_counter() - start_time
-    print(f"Multiprocessing: {duration_multiprocessing:.2f} seconds")
-
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,6 @@
+import os
+import sys
+
+# etl_pipeline.py and scripts/ are plain modules rather than an installed package
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [ROOT, os.path.join(ROOT, "scripts")]
@@ -0,0 +1,86 @@
+import pandas as pd
+import pytest
+
+import data_cleaning
+
+NONCONTROLLING_EQUITY = (
+    "StockholdersEquityIncludingPortionAttributableToNoncontrollingInterest"
+)
+
+
+def account(values: dict, fp: str = "FY") -> dict:
+    """companyfacts entry for an account with one record per {year: value}."""
+    return {
+        "units": {
+            "USD": [
+                {"end": f"{year}-12-31", "fp": fp, "val": val}
+                for year, val in values.items()
+            ]
+        }
+    }
+
+
+def test_get_df_keeps_last_fy_record_per_year():
+    data = {
+        "Assets": {
+            "units": {
+                "USD": [
+                    {"end": "2020-03-31", "fp": "Q1", "val": 1},
+                    {"end": "2020-12-31", "fp": "FY", "val": 2},
+                    {"end": "2020-12-31", "fp": "FY", "val": 3},
+                    {"end": "2021-12-31", "val": 4},
+                ]
+            }
+        }
+    }
+    df = data_cleaning.get_df(data, "Assets")
+    assert df["Assets"].to_dict() == {2020: 3.0}
+
+
+def test_get_df_without_fy_records_is_empty_and_numeric():
+    df = data_cleaning.get_df({"Assets": account({2020: 1}, fp="Q1")}, "Assets")
+    assert df.empty
+    assert df["Assets"].dtype == "float64"
+
+
+def test_equity_falls_back_to_noncontrolling_interest():
+    data = {NONCONTROLLING_EQUITY: account({2020: 40, 2021: 50})}
+    equity_df = data_cleaning.get_equity_df(data)
+    assert list(equity_df.columns) == ["Equity"]
+    assert equity_df["Equity"].to_dict() == {2020: 40.0, 2021: 50.0}
+
+
+def test_liabilities_derived_when_missing():
+    data = {
+        "Assets": account({2020: 100, 2021: 120}),
+        "StockholdersEquity": account({2020: 40, 2021: 50}),
+    }
+    final_dict = data_cleaning.clean_company_data_using_dataframes(data)
+    assert final_dict["Liabilities"] == {0: 60.0, 1: 70.0}
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        {
+            "Assets": account({2020: 100, 2021: 120}),
+            "StockholdersEquity": account({2020: 40, 2021: 50}),
+            "Liabilities": account({2020: 60, 2021: 70}),
+        },
+        {
+            "Assets": account({2020: 100, 2021: 120}),
+            "StockholdersEquity": account({2021: 50}),
+        },
+        {
+            "Assets": account({2020: 100, 2021: 120}),
+            NONCONTROLLING_EQUITY: account({2021: 50}),
+            "Liabilities": account({2019: 7}),
+        },
+    ],
+    ids=["complete", "derived-liabilities", "equity-fallback"],
+)
+def test_clean_company_data_matches_dataframe_route(data):
+    pd.testing.assert_frame_equal(
+        pd.DataFrame(data_cleaning.clean_company_data(data)),
+        pd.DataFrame(data_cleaning.clean_company_data_using_dataframes(data)),
+    )
@@ -0,0 +1,58 @@
+import asyncio
+
+import orjson
+import pytest
+
+import data_fetching
+
+DOCUMENTS = {f"CIK000000000{i}.json": {"cik": i} for i in range(3)}
+
+
+@pytest.fixture
+def facts_dir(tmp_path):
+    for name, document in DOCUMENTS.items():
+        (tmp_path / name).write_bytes(orjson.dumps(document))
+    return tmp_path
+
+
+def test_fetch_file_parses_by_default(facts_dir):
+    assert data_fetching.fetch_file(facts_dir / "CIK0000000001.json") == {"cik": 1}
+
+
+def test_fetch_file_returns_raw_bytes_without_parse(facts_dir):
+    data = data_fetching.fetch_file(facts_dir / "CIK0000000001.json", parse=False)
+    assert data == orjson.dumps({"cik": 1})
+
+
+def test_fetch_file_missing_file_returns_none(tmp_path):
+    assert data_fetching.fetch_file(tmp_path / "missing.json") is None
+
+
+def run_fetcher(fetcher, *args, **kwargs):
+    result = fetcher(*args, **kwargs)
+    return asyncio.run(result) if asyncio.iscoroutine(result) else result
+
+
+FETCHERS = [
+    data_fetching.fetch_all_files,
+    data_fetching.fetch_all_files_async,
+    data_fetching.fetch_all_files_threading,
+]
+
+
+@pytest.mark.parametrize("fetcher", FETCHERS)
+def test_fetchers_do_not_keep_results_by_default(fetcher, facts_dir):
+    assert run_fetcher(fetcher, facts_dir, len(DOCUMENTS)) is None
+
+
+@pytest.mark.parametrize("fetcher", FETCHERS)
+def test_fetchers_collect_parsed_documents(fetcher, facts_dir):
+    results = run_fetcher(fetcher, facts_dir, len(DOCUMENTS), collect=True)
+    assert sorted(results, key=lambda doc: doc["cik"]) == list(DOCUMENTS.values())
+
+
+@pytest.mark.parametrize("fetcher", FETCHERS)
+def test_fetchers_collect_raw_bytes_without_parse(fetcher, facts_dir):
+    results = run_fetcher(fetcher, facts_dir, 2, parse=False, collect=True)
+    assert len(results) == 2
+    assert all(raw in map(orjson.dumps, DOCUMENTS.values()) for raw in results)
@@ -0,0 +1,362 @@
+import asyncio
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import orjson
+import pandas as pd
+import pytest
+import requests
+
+import etl_pipeline
+
+CIK = "0000000001"
+FACTS = {"cik": 1, "facts": {"us-gaap": {}}}
+TICKERS = {"0": {"ticker": "META", "cik_str": 1326801}}
+
+
+def make_response(status_code: int = 200, body: bytes = b"", etag: str = ""):
+    response = requests.Response()
+    response.status_code = status_code
+    response.url = "https://sec.test"
+    response._content = body
+    response._content_consumed = True
+    if etag:
+        response.headers["ETag"] = etag
+    return response
+
+
+class FakeGet:
+    """Stand-in for SESSION.get that replays responses and records request headers."""
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.calls = []
+
+    def __call__(self, url, headers=None, **kwargs):
+        self.calls.append(headers or {})
+        response = self.responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(etl_pipeline, "CACHE_DIR", str(tmp_path))
+    etl_pipeline._build_ticker_index.cache_clear()
+    etl_pipeline._get_cik_list.cache_clear()
+    yield tmp_path
+    etl_pipeline._build_ticker_index.cache_clear()
+    etl_pipeline._get_cik_list.cache_clear()
+
+
+@pytest.fixture
+def fake_get(monkeypatch):
+    def install(*responses):
+        fake = FakeGet(*responses)
+        monkeypatch.setattr(etl_pipeline.SESSION, "get", fake)
+        return fake
+
+    return install
+
+
+def tickers_path(cache_dir) -> str:
+    return os.path.join(cache_dir, "company_tickers.json")
+
+
+def facts_path(cache_dir) -> str:
+    return os.path.join(cache_dir, "facts", f"CIK{CIK}.json")
+
+
+def write_cache(path: str, body: bytes, etag: str = '"v1"', stale: bool = False):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(body)
+    with open(path + ".etag", "wb") as f:
+        f.write(orjson.dumps({"ETag": etag}))
+    if stale:
+        os.utime(path, (0, 0))
+
+
+def test_tickers_download_is_cached_with_validators(cache_dir, fake_get):
+    fake_get(make_response(body=orjson.dumps(TICKERS), etag='"v1"'))
+    assert etl_pipeline.fetch_cik("META") == "0001326801"
+
+    with open(tickers_path(cache_dir), "rb") as f:
+        assert orjson.loads(f.read()) == TICKERS
+    assert etl_pipeline._conditional_headers(tickers_path(cache_dir)) == {
+        "If-None-Match": '"v1"'
+    }
+    assert not [name for name in os.listdir(cache_dir) if "part" in name]
+
+
+def test_truncated_tickers_cache_recovers(cache_dir, fake_get):
+    write_cache(tickers_path(cache_dir), orjson.dumps(TICKERS)[:10], stale=True)
+    fake = fake_get(make_response(304), make_response(body=orjson.dumps(TICKERS)))
+    assert etl_pipeline.fetch_cik("META") == "0001326801"
+    assert fake.calls == [{"If-None-Match": '"v1"'}, {}]
+    with open(tickers_path(cache_dir), "rb") as f:
+        assert orjson.loads(f.read()) == TICKERS
+
+
+def test_facts_download_is_cached_with_validators(cache_dir, fake_get):
+    fake_get(make_response(body=orjson.dumps(FACTS), etag='"v1"'))
+    assert etl_pipeline.fetch_sec_api(CIK) == FACTS
+
+    with open(facts_path(cache_dir), "rb") as f:
+        assert orjson.loads(f.read()) == FACTS
+    with open(facts_path(cache_dir) + ".etag", "rb") as f:
+        assert orjson.loads(f.read()) == {"ETag": '"v1"'}
+    assert not [name for name in os.listdir(cache_dir / "facts") if "part" in name]
+
+
+def test_fresh_facts_copy_is_used_without_a_request(cache_dir, fake_get):
+    write_cache(facts_path(cache_dir), orjson.dumps(FACTS))
+    fake = fake_get()
+    assert etl_pipeline.fetch_sec_api(CIK) == FACTS
+    assert fake.calls == []
+
+
+def test_no_cache_always_downloads(cache_dir, fake_get):
+    write_cache(facts_path(cache_dir), orjson.dumps({"old": True}))
+    fake = fake_get(make_response(body=orjson.dumps(FACTS)))
+    assert etl_pipeline.fetch_sec_api(CIK, use_cache=False) == FACTS
+    assert fake.calls == [{}]
+
+
+def test_unwritable_cache_dir_is_not_fatal(tmp_path, monkeypatch, fake_get):
+    not_a_dir = tmp_path / "file"
+    not_a_dir.write_text("")
+    monkeypatch.setattr(etl_pipeline, "CACHE_DIR", str(not_a_dir / "cache"))
+    etl_pipeline._build_ticker_index.cache_clear()
+    fake_get(
+        make_response(body=orjson.dumps(TICKERS)),
+        make_response(body=orjson.dumps(FACTS)),
+    )
+    assert etl_pipeline.fetch_cik("META") == "0001326801"
+    assert etl_pipeline.fetch_sec_api(CIK) == FACTS
+    etl_pipeline._build_ticker_index.cache_clear()
+
+
+def test_corrupt_fresh_copy_is_downloaded_again(cache_dir, fake_get):
+    write_cache(facts_path(cache_dir), orjson.dumps(FACTS)[:10])
+    fake = fake_get(make_response(body=orjson.dumps(FACTS)))
+    assert etl_pipeline.fetch_sec_api(CIK) == FACTS
+    assert fake.calls == [{}]
+
+
+def test_corrupt_fresh_tickers_copy_is_downloaded_again(cache_dir, fake_get):
+    write_cache(tickers_path(cache_dir), orjson.dumps(TICKERS)[:10])
+    fake = fake_get(make_response(body=orjson.dumps(TICKERS)))
+    assert etl_pipeline.fetch_cik("META") == "0001326801"
+    assert fake.calls == [{}]
+
+
+def test_stale_copy_is_revalidated_and_reused_on_304(cache_dir, fake_get):
+    write_cache(facts_path(cache_dir), orjson.dumps(FACTS), stale=True)
+    fake = fake_get(make_response(304))
+    assert etl_pipeline.fetch_sec_api(CIK) == FACTS
+    assert fake.calls == [{"If-None-Match": '"v1"'}]
+    assert etl_pipeline._is_fresh(facts_path(cache_dir), 60)
+
+
+def test_stale_copy_is_replaced_when_changed(cache_dir, fake_get):
+    write_cache(facts_path(cache_dir), orjson.dumps(FACTS), stale=True)
+    new_facts = {"cik": 1, "facts": {"us-gaap": {"Assets": {}}}}
+    fake_get(make_response(body=orjson.dumps(new_facts), etag='"v2"'))
+    assert etl_pipeline.fetch_sec_api(CIK) == new_facts
+    assert etl_pipeline._conditional_headers(facts_path(cache_dir)) == {
+        "If-None-Match": '"v2"'
+    }
+
+
+def test_corrupt_stale_copy_is_discarded_after_304(cache_dir, fake_get):
+    write_cache(facts_path(cache_dir), orjson.dumps(FACTS)[:10], stale=True)
+    fake = fake_get(make_response(304), make_response(body=orjson.dumps(FACTS)))
+    assert etl_pipeline.fetch_sec_api(CIK) == FACTS
+    assert fake.calls == [{"If-None-Match": '"v1"'}, {}]
+
+
+def test_corrupt_validators_fall_back_to_a_plain_get(cache_dir, fake_get):
+    write_cache(facts_path(cache_dir), orjson.dumps(FACTS), stale=True)
+    with open(facts_path(cache_dir) + ".etag", "w") as f:
+        f.write("{not json")
+    fake = fake_get(make_response(body=orjson.dumps(FACTS)))
+    assert etl_pipeline.fetch_sec_api(CIK) == FACTS
+    assert fake.calls == [{}]
+
+
+def test_stale_copy_is_served_when_the_request_fails(cache_dir, fake_get):
+    write_cache(facts_path(cache_dir), orjson.dumps(FACTS), stale=True)
+    fake_get(requests.ConnectionError("offline"))
+    assert etl_pipeline.fetch_sec_api(CIK) == FACTS
+
+
+def test_request_failure_without_a_cached_copy(cache_dir, fake_get):
+    fake_get(requests.ConnectionError("offline"))
+    assert etl_pipeline.fetch_sec_api(CIK) == {}
+
+
+def test_stale_caches_are_served_when_offline(cache_dir, fake_get):
+    write_cache(tickers_path(cache_dir), orjson.dumps(TICKERS), stale=True)
+    meta_path = os.path.join(cache_dir, "facts", "CIK0001326801.json")
+    gaap = {"Assets": {"units": {"USD": []}}}
+    write_cache(meta_path, orjson.dumps({"facts": {"us-gaap": gaap}}), stale=True)
+    offline = requests.ConnectionError("offline")
+    fake_get(offline, offline)
+    assert etl_pipeline.fetch_facts("META") == gaap
+
+
+def test_fetch_facts_skips_the_request_for_an_unknown_ticker(cache_dir, fake_get):
+    fake = fake_get(make_response(body=orjson.dumps(TICKERS)))
+    assert etl_pipeline.fetch_facts("NOPE") == {}
+    assert len(fake.calls) == 1
+
+
+def test_session_is_rate_limited():
+    adapter = etl_pipeline.SESSION.get_adapter(etl_pipeline.FACTS_URL)
+    assert isinstance(adapter, etl_pipeline._RateLimitedAdapter)
+    assert adapter.min_interval == 1 / etl_pipeline.MAX_REQUESTS_PER_SECOND
+
+
+def test_rate_limited_adapter_spaces_concurrent_requests(monkeypatch):
+    starts = []
+    monkeypatch.setattr(
+        requests.adapters.HTTPAdapter,
+        "send",
+        lambda self, request, **kwargs: starts.append(time.monotonic()),
+    )
+    adapter = etl_pipeline._RateLimitedAdapter(min_interval=0.05)
+    with ThreadPoolExecutor(max_workers=5) as executor:
+        list(executor.map(adapter.send, [None] * 5))
+
+    starts.sort()
+    gaps = [later - earlier for earlier, later in zip(starts, starts[1:])]
+    assert min(gaps) >= 0.045
+
+
+def test_ticker_index_is_built_once_by_concurrent_callers(cache_dir, monkeypatch):
+    fake = FakeGet(make_response(body=orjson.dumps(TICKERS)))
+
+    def slow_get(*args, **kwargs):
+        time.sleep(0.05)
+        return fake(*args, **kwargs)
+
+    monkeypatch.setattr(etl_pipeline.SESSION, "get", slow_get)
+    with ThreadPoolExecutor(max_workers=10) as executor:
+        ciks = list(executor.map(etl_pipeline.fetch_cik, ["META"] * 10))
+    assert ciks == ["0001326801"] * 10
+    assert len(fake.calls) == 1
+
+
+def test_fetch_many_fetches_repeated_ciks_once(monkeypatch):
+    calls = []
+
+    def fetch_sec_api(cik, use_cache):
+        calls.append(cik)
+        return {"cik": cik}
+
+    monkeypatch.setattr(etl_pipeline, "fetch_sec_api", fetch_sec_api)
+    results = asyncio.run(etl_pipeline.fetch_many(["1", "2", "1"]))
+    assert results == [{"cik": "1"}, {"cik": "2"}, {"cik": "1"}]
+    assert sorted(calls) == ["1", "2"]
+
+
+def fy_records(values: dict) -> dict:
+    """us-gaap entry with one FY record per {end date: value}."""
+    return {
+        "units": {
+            "USD": [{"end": end, "fp": "FY", "val": val} for end, val in values.items()]
+        }
+    }
+
+
+def test_clean_company_data_keeps_last_fy_record_per_year():
+    gaap = fy_records({"2020-12-31": 1, "2021-12-31": 2})
+    gaap["units"]["USD"] += [
+        {"end": "2021-12-31", "fp": "FY", "val": 3},
+        {"end": "2021-09-30", "fp": "Q3", "val": 4},
+    ]
+    df = etl_pipeline.clean_company_data({"Assets": gaap}, ["Assets"])
+    assert df.to_dict("list") == {"year": [2020, 2021], "Assets": [1, 3]}
+
+
+def test_clean_company_data_restores_int64_for_gap_free_accounts():
+    gaap = {
+        "Assets": fy_records({"2020-12-31": 10, "2021-12-31": 0}),
+        "Cash": fy_records({"2021-12-31": 5}),
+    }
+    df = etl_pipeline.clean_company_data(gaap, ["Assets", "Cash", "Missing"])
+
+    assert list(df.columns) == ["year", "Assets", "Cash", "Missing"]
+    assert df["year"].tolist() == [2020, 2021]
+    assert df["Assets"].dtype == "int64"
+    assert df["Cash"].dtype == "float64"
+    assert df["Cash"].isna().tolist() == [True, False]
+    assert df["Missing"].isna().all()
+
+
+def test_clean_company_data_keeps_fractional_values_as_float():
+    gaap = {"Ratio": fy_records({"2020-12-31": 0.5})}
+    df = etl_pipeline.clean_company_data(gaap, ["Ratio"])
+    assert df["Ratio"].tolist() == [0.5]
+
+
+def summary_inputs(**columns) -> pd.DataFrame:
+    values = dict.fromkeys(
+        ["CashFlows", "Cash", "LongTermDebt", "AssetsCurrent", "Liabilities"], [1]
+    )
+    return pd.DataFrame({"year": [2020], **values, **columns})
+
+
+def test_add_extra_columns_keeps_integer_valuation():
+    df = etl_pipeline.add_extra_columns(summary_inputs(CashFlows=[10], Cash=[500]))
+    assert df["valuation"].dtype == "int64"
+    assert df["valuation"].tolist() == [10 * 20 + 500 - 1]
+    assert etl_pipeline._format_values(df)["LongTermDebt"].tolist() == ["1"]
+
+
+def test_add_extra_columns_uses_float_valuation_with_gaps():
+    df = etl_pipeline.add_extra_columns(summary_inputs(Cash=[np.nan]))
+    assert df["valuation"].dtype == "float64"
+    assert np.isnan(df["valuation"][0])
+
+
+def test_add_extra_columns_divides_by_zero_without_warnings():
+    inputs = summary_inputs(CashFlows=[-5], AssetsCurrent=[0], Liabilities=[0])
+    with np.errstate(all="raise"):
+        df = etl_pipeline.add_extra_columns(inputs)
+    assert df["cf/l"].tolist() == [-np.inf]
+    assert np.isnan(df["ac/l"][0])
+
+
+def test_add_extra_columns_rounds_ratios_and_leaves_input_alone():
+    inputs = summary_inputs(AssetsCurrent=[2], Liabilities=[3])
+    df = etl_pipeline.add_extra_columns(inputs)
+    assert df["ac/l"].tolist() == [0.67]
+    assert "valuation" not in inputs.columns
+
+
+def test_fetch_cik_looks_up_a_zero_padded_cik(cache_dir, fake_get):
+    tickers = {**TICKERS, "1": {"ticker": "AMZN", "cik_str": 1018724}}
+    fake = fake_get(make_response(body=orjson.dumps(tickers)))
+    assert etl_pipeline.fetch_cik("amzn") == "0001018724"
+    assert etl_pipeline.fetch_cik("META") == "0001326801"
+    assert etl_pipeline.fetch_cik() in {"0001018724", "0001326801"}
+    assert etl_pipeline._get_ticker_index() == {
+        "META": "0001326801",
+        "AMZN": "0001018724",
+    }
+    assert len(fake.calls) == 1
+
+
+def test_fetch_cik_unknown_ticker(cache_dir, fake_get):
+    fake_get(make_response(body=orjson.dumps(TICKERS)))
+    assert etl_pipeline.fetch_cik("NOPE") == ""
+
+
+def test_fetch_cik_request_failure(cache_dir, fake_get):
+    fake_get(requests.ConnectionError("offline"))
+    assert etl_pipeline.fetch_cik("META") == ""